@@ -2,10 +2,33 @@ import os
 import json
 import glob
 
-def aggregate_fishery_data(input_dir, output_file):
+from lot_ids import LOT_TYPE_ORDER, parse_lot_id, lot_key_to_dict, natural_sort_key, build_range_index
+
+def write_lot_index(aggregated_data, index_file):
+    """
+    Writes the sorted key array of all aggregated lots, so consumers can
+    answer basin/type/year/sequence range queries by binary search.
+    """
+    lots = [lot for lots in aggregated_data.values() for lot in lots]
+    index = build_range_index(lots)
+
+    keys = []
+    for (basin, _, lot_type, year, sequence), lot in zip(index.keys, index.lots):
+        keys.append([basin, lot_type, year, sequence,
+                     lot.get('location'), lot.get('contract', {}).get('winner')])
+
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "fields": ["basin", "lot_type", "year", "sequence", "location", "winner"],
+            "lot_type_order": LOT_TYPE_ORDER,
+            "keys": keys,
+        }, f, ensure_ascii=False, separators=(',', ':'))
+
+def aggregate_fishery_data(input_dir, output_file, index_file=None):
     """
     Loads JSON files from a directory, aggregates 'lots' data,
-    and structures it by 'contract.winner'.
+    and structures it by 'contract.winner'. Each winner's lots are in
+    natural lot_id order (DBL2 before DBL10).
     """
     aggregated_data = {}
     
@@ -14,9 +37,13 @@ def aggregate_fishery_data(input_dir, output_file):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    json_files = glob.glob(os.path.join(input_dir, '*.json'))
+    json_files = sorted(glob.glob(os.path.join(input_dir, '*.json')))
 
     for file_path in json_files:
+        # User submissions belong in the intake log (submission_intake.py);
+        # never ingest stray submission files as reservoirs.
+        if os.path.basename(file_path).startswith('submission_'):
+            continue
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -26,6 +53,8 @@ def aggregate_fishery_data(input_dir, output_file):
                 for lot in lots:
                     # Add location to each lot
                     lot['location'] = location
+                    # Reservoir files no converter regenerates lack lot_key
+                    lot.setdefault('lot_key', lot_key_to_dict(parse_lot_id(lot.get('lot_id'))))
                     
                     winner = lot.get('contract', {}).get('winner')
                     
@@ -39,6 +68,9 @@ def aggregate_fishery_data(input_dir, output_file):
         except Exception as e:
             print(f"An unexpected error occurred while processing {file_path}: {e}")
 
+    for lots in aggregated_data.values():
+        lots.sort(key=natural_sort_key)
+
     # Save the aggregated data to a single JSON file
     try:
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -47,7 +79,15 @@ def aggregate_fishery_data(input_dir, output_file):
     except Exception as e:
         print(f"Error saving aggregated data to {output_file}: {e}")
 
+    if index_file:
+        try:
+            write_lot_index(aggregated_data, index_file)
+            print(f"Lot range index saved to {index_file}")
+        except Exception as e:
+            print(f"Error saving lot range index to {index_file}: {e}")
+
 if __name__ == "__main__":
     input_directory = 'public/json/'
     output_filename = 'public/json/aggregated_fishery_data.json'
-    aggregate_fishery_data(input_directory, output_filename)
+    index_filename = 'public/json/lot_index.json'
+    aggregate_fishery_data(input_directory, output_filename, index_filename)
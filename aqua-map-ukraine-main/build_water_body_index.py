@@ -0,0 +1,138 @@
+import os
+import re
+import glob
+import json
+import hashlib
+
+UNKNOWN_REGION = 'Невідомий регіон'
+
+# Misspelled and Russian-language region names found in the source data.
+REGION_ALIASES = {
+    'Вінницка область': 'Вінницька область',
+    'Вінницькая область': 'Вінницька область',
+    'Виіницька область': 'Вінницька область',
+    'Виінницька область': 'Вінницька область',
+    'Львівска область': 'Львівська область',
+    'Черкасская область': 'Черкаська область',
+    'Одесская область': 'Одеська область',
+    'Хмельницкая область': 'Хмельницька область',
+    'Тернопольская область': 'Тернопільська область',
+    'Харьківська область': 'Харківська область',
+}
+
+TOKEN_FIELDS = ('waterBodyName', 'lesseeName', 'settlement')
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+MIN_TOKEN_LENGTH = 2
+
+
+def normalize_region(region):
+    """Maps a raw region string onto its canonical name."""
+    if not region or not isinstance(region, str):
+        return UNKNOWN_REGION
+    region = ' '.join(region.split())
+    return REGION_ALIASES.get(region, region)
+
+
+def tokenize(value):
+    """Splits a text value into lowercase word tokens for the search index."""
+    if not value or not isinstance(value, str):
+        return set()
+    return {t for t in TOKEN_PATTERN.findall(value.lower()) if len(t) >= MIN_TOKEN_LENGTH}
+
+
+def chunk_file_name(region):
+    """Derives a stable, ASCII-only chunk file name from the region name."""
+    digest = hashlib.sha1(region.encode('utf-8')).hexdigest()
+    return f"region-{digest[:8]}.json"
+
+
+def add_posting(index, key, ref):
+    """Appends a record ref to the inverted list of `key`."""
+    if key is None or key == '':
+        return
+    index.setdefault(key, []).append(ref)
+
+
+def build_water_body_index(input_file, output_dir):
+    """
+    Splits the water body dataset into per-region chunks and builds a filter
+    index with inverted lists for purpose and lessee plus a token index over
+    water body name, lessee name and settlement. A region filter is the ref
+    range start..start+count of its entry in `chunks`.
+
+    Records are addressed by `ref`, their position in region-sorted order, so
+    every chunk covers a contiguous ref range. Source IDs are not unique and
+    are kept on the records as-is.
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    # Group by canonical region, keeping source order within a region.
+    by_region = {}
+    for record in records:
+        region = normalize_region((record.get('location') or {}).get('region'))
+        by_region.setdefault(region, []).append(record)
+
+    chunks_dir = os.path.join(output_dir, 'chunks')
+    os.makedirs(chunks_dir, exist_ok=True)
+    # Chunks of regions that were renamed or dropped would otherwise linger.
+    for stale_file in glob.glob(os.path.join(chunks_dir, 'region-*.json')):
+        os.remove(stale_file)
+
+    chunks = []
+    purpose_index = {}
+    lessee_index = {}
+    token_index = {}
+
+    ref = 0
+    for region in sorted(by_region):
+        region_records = by_region[region]
+        file_name = chunk_file_name(region)
+        chunk = []
+        start = ref
+
+        for record in region_records:
+            location = record.get('location') or {}
+            add_posting(purpose_index, (record.get('purpose') or '').strip(), ref)
+            add_posting(lessee_index, (record.get('lesseeName') or '').strip(), ref)
+
+            tokens = set()
+            for field in TOKEN_FIELDS:
+                value = location.get(field) if field == 'settlement' else record.get(field)
+                tokens |= tokenize(value)
+            for token in tokens:
+                add_posting(token_index, token, ref)
+
+            chunk.append(dict(record, ref=ref))
+            ref += 1
+
+        with open(os.path.join(chunks_dir, file_name), 'w', encoding='utf-8') as f:
+            json.dump(chunk, f, ensure_ascii=False, separators=(',', ':'))
+
+        chunks.append({
+            'region': region,
+            'file': f"chunks/{file_name}",
+            'start': start,
+            'count': len(chunk),
+        })
+
+    index = {
+        'total': ref,
+        'chunks': chunks,
+        'purpose': purpose_index,
+        'lessee': lessee_index,
+        'tokens': dict(sorted(token_index.items())),
+    }
+
+    index_file = os.path.join(output_dir, 'index.json')
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {ref} water bodies into {len(chunks)} region chunks "
+          f"({len(token_index)} tokens) in {output_dir}")
+
+
+if __name__ == "__main__":
+    input_filename = 'src/data/vodni_obiekty_1748944527.json'
+    output_directory = 'public/json/water_bodies'
+    build_water_body_index(input_filename, output_directory)
@@ -0,0 +1,200 @@
+import os
+import json
+import glob
+import hashlib
+from collections import Counter
+
+DELTA_FORMAT_VERSION = 1
+
+
+def lot_key(location, lot, variant=None):
+    """
+    Returns the stable key of a lot: its location and lot_id. The source
+    tables repeat some lot IDs; each repeated lot is told apart by a
+    `variant` derived from its content, never by its row position.
+    """
+    key = f"{location}|{lot.get('lot_id')}"
+    if variant:
+        key += f"#{variant}"
+    return key
+
+
+def lot_hash(lot):
+    """Hashes a lot's canonical JSON form so unchanged lots compare equal."""
+    canonical = json.dumps(lot, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def dataset_version(hashes):
+    """Derives a dataset version from the {key: hash} map of its lots."""
+    digest = hashlib.sha1()
+    for key in sorted(hashes):
+        digest.update(f"{key}:{hashes[key]}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def load_lot_map(file_path):
+    """
+    Loads a reservoir JSON ({location, lots}) or the aggregated file
+    ({winner: [lots]}) into a {key: lot} map of every lot with a lot_id.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and 'lots' in data:
+        location = data.get('location')
+        entries = [(location, lot) for lot in data.get('lots', [])]
+    else:
+        entries = [(lot.get('location'), lot) for lots in data.values() for lot in lots]
+
+    # Rows without a lot_id are summary and note rows of the source tables.
+    entries = [(location, lot) for location, lot in entries if lot.get('lot_id')]
+    counts = Counter(lot_key(location, lot) for location, lot in entries)
+
+    lot_map = {}
+    for location, lot in entries:
+        key = lot_key(location, lot)
+        if counts[key] > 1:
+            # Keyed by content so inserting or removing a row elsewhere does
+            # not re-key other repeats; identical copies are numbered, which
+            # is stable because they are interchangeable.
+            variant = lot_hash(lot)[:10]
+            key = lot_key(location, lot, variant)
+            copy = 1
+            while key in lot_map:
+                copy += 1
+                key = lot_key(location, lot, f"{variant}-{copy}")
+        lot_map[key] = lot
+    return lot_map
+
+
+def compute_delta(old_hashes, new_lots):
+    """
+    Compares the {key: hash} map of the previous version with the {key: lot}
+    map of the new one in a single pass over each.
+    Returns the delta and the {key: hash} map of the new version.
+    """
+    new_hashes = {key: lot_hash(lot) for key, lot in new_lots.items()}
+
+    added = {}
+    changed = {}
+    for key, digest in new_hashes.items():
+        old_digest = old_hashes.get(key)
+        if old_digest is None:
+            added[key] = new_lots[key]
+        elif old_digest != digest:
+            changed[key] = new_lots[key]
+    removed = [key for key in old_hashes if key not in new_hashes]
+
+    delta = {
+        "format": DELTA_FORMAT_VERSION,
+        "from": dataset_version(old_hashes),
+        "to": dataset_version(new_hashes),
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+    return delta, new_hashes
+
+
+def apply_delta(lot_map, delta):
+    """
+    Applies a delta to a {key: lot} map and returns the updated map.
+    Raises ValueError if the map is not the version the delta was built from,
+    or if the result does not match the version the delta leads to.
+    """
+    if delta.get("format") != DELTA_FORMAT_VERSION:
+        raise ValueError(f"Unsupported delta format: {delta.get('format')}")
+
+    hashes = {key: lot_hash(lot) for key, lot in lot_map.items()}
+    if dataset_version(hashes) != delta["from"]:
+        raise ValueError(f"Delta expects version {delta['from']}, got {dataset_version(hashes)}")
+
+    updated = dict(lot_map)
+    for key in delta["removed"]:
+        updated.pop(key, None)
+        hashes.pop(key, None)
+    for section in ("added", "changed"):
+        for key, lot in delta[section].items():
+            updated[key] = lot
+            hashes[key] = lot_hash(lot)
+
+    if dataset_version(hashes) != delta["to"]:
+        raise ValueError(f"Delta produced version {dataset_version(hashes)}, expected {delta['to']}")
+    return updated
+
+
+def update_deltas(dataset_file, deltas_dir):
+    """
+    Diffs a dataset file against its last snapshot and writes the delta,
+    the new snapshot and the manifest under deltas_dir/<dataset name>/.
+    """
+    name = os.path.splitext(os.path.basename(dataset_file))[0]
+    dataset_dir = os.path.join(deltas_dir, name)
+    snapshot_file = os.path.join(dataset_dir, 'snapshot.json')
+    manifest_file = os.path.join(dataset_dir, 'manifest.json')
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    new_lots = load_lot_map(dataset_file)
+
+    snapshot = None
+    if os.path.exists(snapshot_file):
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+    manifest = {"dataset": name, "latest": None, "deltas": []}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    delta, new_hashes = compute_delta(snapshot["hashes"] if snapshot else {}, new_lots)
+    version = delta["to"]
+
+    if snapshot is None:
+        print(f"{name}: no snapshot yet, recording base version {version}")
+    elif snapshot["version"] == version:
+        print(f"{name}: unchanged at version {version}")
+        return
+    else:
+        delta_filename = f"{delta['from']}-{version}.json"
+        with open(os.path.join(dataset_dir, delta_filename), 'w', encoding='utf-8') as f:
+            json.dump(delta, f, ensure_ascii=False, separators=(',', ':'))
+
+        manifest["deltas"].append({
+            "from": delta["from"],
+            "to": version,
+            "file": delta_filename,
+            "added": len(delta["added"]),
+            "removed": len(delta["removed"]),
+            "changed": len(delta["changed"]),
+        })
+        print(f"{name}: {delta['from']} -> {version} "
+              f"(+{len(delta['added'])} -{len(delta['removed'])} ~{len(delta['changed'])})")
+
+    manifest["latest"] = version
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    with open(snapshot_file, 'w', encoding='utf-8') as f:
+        json.dump({"version": version, "hashes": new_hashes}, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def diff_fishery_data(input_dir, deltas_dir):
+    """Updates deltas for the aggregated file and every reservoir JSON in input_dir."""
+    for file_path in sorted(glob.glob(os.path.join(input_dir, '*.json'))):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"Error decoding JSON from {file_path}: {e}")
+            continue
+
+        is_reservoir = isinstance(data, dict) and 'lots' in data
+        is_aggregated = os.path.basename(file_path) == 'aggregated_fishery_data.json'
+        if is_reservoir or is_aggregated:
+            update_deltas(file_path, deltas_dir)
+
+
+if __name__ == "__main__":
+    input_directory = 'public/json/'
+    deltas_directory = 'public/json/deltas'
+    diff_fishery_data(input_directory, deltas_directory)
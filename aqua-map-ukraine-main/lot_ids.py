@@ -0,0 +1,110 @@
+import re
+import bisect
+from collections import namedtuple
+
+# Lot IDs encode basin code, sequence number, lot type and year,
+# e.g. DBL6MID2024, DNI2MIN2024, DBL2MACRO2024, TL1MAX2024, CHDES3MIN2024.
+LOT_ID_PATTERN = re.compile(r'^([A-Z]{2,5})(\d{1,3})([A-Z]{3,5})(\d{4})$')
+
+# Lot types in the order the source tables list them (by lot size).
+LOT_TYPE_ORDER = ['MIN', 'MID', 'MAX', 'MACRO', 'SPEC']
+
+LotKey = namedtuple('LotKey', ['basin', 'sequence', 'lot_type', 'year'])
+
+# Sorted range keys with the lots they belong to, in the same order.
+LotRangeIndex = namedtuple('LotRangeIndex', ['keys', 'lots'])
+
+
+def parse_lot_id(lot_id):
+    """Decomposes a lot ID into a LotKey, or returns None if it doesn't match."""
+    if not lot_id or not isinstance(lot_id, str):
+        return None
+    match = LOT_ID_PATTERN.match(lot_id.strip())
+    if not match:
+        return None
+    basin, sequence, lot_type, year = match.groups()
+    return LotKey(basin, int(sequence), lot_type, int(year))
+
+
+def lot_key_to_dict(key):
+    """Converts a LotKey into the JSON form stored on each lot."""
+    if key is None:
+        return None
+    return key._asdict()
+
+
+def type_rank(lot_type):
+    if lot_type in LOT_TYPE_ORDER:
+        return LOT_TYPE_ORDER.index(lot_type)
+    return len(LOT_TYPE_ORDER)
+
+
+def range_key(key):
+    """
+    Returns the sort tuple of a LotKey: basin, lot type (in table order),
+    year, then numeric sequence, so DBL2 sorts before DBL10.
+    """
+    return (key.basin, type_rank(key.lot_type), key.lot_type, key.year, key.sequence)
+
+
+def natural_sort_key(lot):
+    """Sort key for lot dicts; lots without a valid lot_id go last."""
+    key = parse_lot_id(lot.get('lot_id'))
+    if key is None:
+        return (1,)
+    return (0,) + range_key(key)
+
+
+def build_range_index(lots):
+    """Builds a LotRangeIndex over the lots that have a valid lot_id."""
+    entries = []
+    for lot in lots:
+        key = parse_lot_id(lot.get('lot_id'))
+        if key is not None:
+            entries.append((range_key(key), lot))
+    entries.sort(key=lambda entry: entry[0])
+    return LotRangeIndex([k for k, _ in entries], [lot for _, lot in entries])
+
+
+def query_range(index, basin, lot_type=None, year=None, first=None, last=None):
+    """
+    Returns the lots of a basin, optionally narrowed to a lot type, a year
+    and an inclusive sequence range, e.g. all MAX lots of DBL in 2024 or
+    lots 5-12 of KRE MID. The longest leading run of given criteria is
+    resolved by binary search; criteria after a gap are filtered afterwards.
+    Keys sort by year before sequence, so a sequence range without a year
+    (lots 5-12 of KRE MID across all years) is not one contiguous slice:
+    the search narrows to KRE MID and the range is filtered within it.
+    """
+    lower = [basin]
+    upper = [basin]
+    if lot_type is not None:
+        lower += [type_rank(lot_type), lot_type]
+        upper += [type_rank(lot_type), lot_type]
+        if year is not None:
+            lower.append(year)
+            upper.append(year)
+            if first is not None:
+                lower.append(first)
+            if last is not None:
+                upper.append(last)
+    if len(upper) < 5:
+        # Open upper bound: sorts after every key sharing the prefix.
+        upper.append(float('inf'))
+
+    start = bisect.bisect_left(index.keys, tuple(lower))
+    end = bisect.bisect_right(index.keys, tuple(upper))
+
+    result = []
+    for key, lot in zip(index.keys[start:end], index.lots[start:end]):
+        _, _, key_type, key_year, key_sequence = key
+        if lot_type is not None and key_type != lot_type:
+            continue
+        if year is not None and key_year != year:
+            continue
+        if first is not None and key_sequence < first:
+            continue
+        if last is not None and key_sequence > last:
+            continue
+        result.append(lot)
+    return result
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+
+# Source variants in increasing order of precedence: when the same port
+# appears in several files, fields from later files override earlier ones.
+SOURCE_FILES = [
+    'src/data/fish-ports-data.json',
+    'src/data/fish_ports.json',
+    'src/data/updated-fish-ports.json',
+]
+
+COORDINATES_FIELD = 'Google Maps Coordinates'
+BASE_NUMBER_FIELD = 'Номер місця базування'
+SEA_PORT_NAME_FIELD = 'Назва морського рибного порту, портопункту'
+
+# Sea fishing ports use different column names for the same information
+# as regular basing places; map them onto the basing-place schema.
+FIELD_ALIASES = {
+    'Місцезнаходження': 'Адреса місця базування',
+    'Власник (орендодавець)': 'Власник місця базування',
+}
+
+# Rough bounding box of Ukraine, used to catch swapped or mistyped coordinates.
+LATITUDE_RANGE = (44.0, 53.0)
+LONGITUDE_RANGE = (22.0, 41.0)
+
+
+def parse_coordinates(value):
+    """
+    Parses a "lat, lon" string into a (latitude, longitude) tuple of floats.
+    Returns None if the value is missing, malformed or outside Ukraine.
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    parts = [p.strip() for p in value.split(',')]
+    if len(parts) != 2:
+        return None
+
+    try:
+        latitude, longitude = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+    if not (LATITUDE_RANGE[0] <= latitude <= LATITUDE_RANGE[1]):
+        return None
+    if not (LONGITUDE_RANGE[0] <= longitude <= LONGITUDE_RANGE[1]):
+        return None
+    return latitude, longitude
+
+
+def port_key(region, port):
+    """
+    Returns the dedup key of a port: its basing-place number, or the port
+    name for sea fishing ports which have no number.
+    """
+    identifier = port.get(BASE_NUMBER_FIELD) or port.get(SEA_PORT_NAME_FIELD)
+    if not identifier:
+        return None
+    return (region, str(identifier).strip())
+
+
+def stable_port_id(key):
+    """Derives an ID from the dedup key so it survives re-runs and reordering."""
+    digest = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()
+    return f"fish-port-{digest[:10]}"
+
+
+def normalize_fish_ports(input_files, output_file):
+    """
+    Merges the fish port dataset variants with keyed dedup, pre-parses
+    coordinates into numeric fields and writes one compact region-grouped file.
+    """
+    merged = {}  # region -> {key: port}, insertion-ordered
+
+    for file_path in input_files:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"Skipping missing file: {file_path}")
+            continue
+        except json.JSONDecodeError as e:
+            print(f"Error decoding JSON from {file_path}: {e}")
+            continue
+
+        for region, ports in data.items():
+            region_ports = merged.setdefault(region, {})
+            for port in ports:
+                key = port_key(region, port)
+                if key is None:
+                    print(f"Skipping port without identifier in {file_path} ({region}): {port}")
+                    continue
+
+                normalized = {FIELD_ALIASES.get(k, k): v for k, v in port.items()}
+                region_ports.setdefault(key, {}).update(normalized)
+
+    output = {}
+    total_ports = 0
+    for region, region_ports in merged.items():
+        entries = []
+        for key, port in region_ports.items():
+            coordinates = parse_coordinates(port.pop(COORDINATES_FIELD, None))
+            if coordinates is None:
+                print(f"Skipping port {key[1]} ({region}): missing or invalid coordinates")
+                continue
+
+            entry = {'id': stable_port_id(key)}
+            entry.update(port)
+            entry['latitude'], entry['longitude'] = coordinates
+            entries.append(entry)
+
+        if entries:
+            output[region] = entries
+            total_ports += len(entries)
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Saved {total_ports} fish ports in {len(output)} regions to {output_file}")
+
+
+if __name__ == "__main__":
+    output_filename = 'src/data/fish_ports_normalized.json'
+    normalize_fish_ports(SOURCE_FILES, output_filename)
@@ -3,6 +3,8 @@ import csv
 import json
 import re
 
+from lot_ids import parse_lot_id, lot_key_to_dict
+
 def process_tsv_to_json(input_dir, output_dir):
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
@@ -229,6 +231,9 @@ def process_tsv_to_json(input_dir, output_dir):
                     'vessel_names': parse_vessel_names(vessel_names_raw)
                 }
 
+                # Decompose lot_id into basin, sequence, lot type and year
+                lot['lot_key'] = lot_key_to_dict(parse_lot_id(lot.get('lot_id')))
+
                 # Ensure all required fields are present, even if null
                 lot.setdefault('contract', {})
                 lot['contract'].setdefault('winner', None)
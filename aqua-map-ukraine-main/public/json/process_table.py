@@ -1,11 +1,30 @@
-import pandas as pd
+import os
 import json
-import io
 import re
+import sys
+import argparse
+
+# Requires lot_ids.py from the project root (aqua-map-ukraine-main/). It is
+# imported from sys.path when available (e.g. run with PYTHONPATH set to the
+# project root); otherwise this script must sit in the repository checkout,
+# two levels below the root, which is the only place it is looked up.
+try:
+    from lot_ids import parse_lot_id, lot_key_to_dict
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+    from lot_ids import parse_lot_id, lot_key_to_dict
+
+# Lot IDs this table format accepts (e.g. DBL6MID2024). Only used to pick
+# data rows; lot_ids.parse_lot_id decomposes the accepted IDs.
+LOT_ID_FILTER = r'^[A-Z]{3,4}\d{1,2}[A-Z]{3,5}\d{4}$'
+
+def is_missing(value):
+    """Returns True for None and NaN, without importing pandas."""
+    return value is None or (isinstance(value, float) and value != value)
 
 def clean_value(value):
     """Cleans and converts string values to appropriate types."""
-    if pd.isna(value) or str(value).strip() == '':
+    if is_missing(value) or str(value).strip() == '':
         return None
     s_value = str(value).strip().replace(',', '.')
     try:
@@ -20,7 +39,7 @@ def clean_value(value):
 
 def parse_tag_ids(tag_string):
     """Parses tag IDs, separating potential notes."""
-    if pd.isna(tag_string) or str(tag_string).strip() == '':
+    if is_missing(tag_string) or str(tag_string).strip() == '':
         return [], None
 
     tags = []
@@ -43,10 +62,54 @@ def parse_tag_ids(tag_string):
                 notes = line
     return tags, notes
 
-def process_table_data(table_text):
+def read_rows_python(data_lines, column_names):
+    """
+    Splits data lines into row dicts the same way pandas' python engine does
+    for the r'\t+' separator: runs of tabs are one separator and there is no
+    quote handling. Missing trailing fields are None.
+    Returns None if a row has more fields than columns, which pandas treats
+    as an implicit index and this engine does not replicate.
+    """
+    separator = re.compile(r'\t+')
+    rows = []
+    for line in data_lines:
+        fields = separator.split(line.strip())
+        if len(fields) > len(column_names):
+            return None
+        row = dict.fromkeys(column_names)
+        row.update(zip(column_names, fields))
+        rows.append(row)
+    return rows
+
+def read_rows_pandas(data_lines, column_names):
+    """
+    Parses data lines into row dicts with pandas, imported on first use.
+    Only needed for rows wider than the header, which pandas reads as an
+    implicit index; the Python engine is faster at every input size.
+    """
+    import io
+    import pandas as pd
+
+    data_io = io.StringIO("\n".join(data_lines))
+    # Read with multiple tabs as separator, no header as we'll set names manually.
+    # Every column is read as text like the Python engine does; clean_value
+    # converts numbers, and type guessing would turn tag "0123" into 123.
+    df = pd.read_csv(data_io, sep=r'\t+', header=None, names=column_names, engine='python',
+                     keep_default_na=False, dtype=str)
+    return df.to_dict('records')
+
+def process_table_data(table_text, engine='auto'):
     """
     Processes the raw table text into a structured JSON format.
+
+    `engine` selects how data rows are parsed: 'python' uses the
+    pure-Python splitter, 'pandas' uses pandas.read_csv, and 'auto' uses
+    the splitter, falling back to pandas only for rows wider than the
+    header. Both engines produce identical output.
     """
+    if engine not in ('auto', 'python', 'pandas'):
+        raise ValueError(f"Unknown engine: {engine}")
+
     lines = table_text.strip().split('\n')
 
     # Identify general metadata (title, location)
@@ -194,27 +257,30 @@ def process_table_data(table_text):
         parts = line.split('\t')
         # Check for specific lot type or a number in the first column, AND a lot_id pattern in one of the first few columns
         if (len(parts) > 1 and re.match(r'^(MIN|MID|MAX|MACRO|SPEC)$', parts[0].strip()) or re.match(r'^\d+$', parts[0].strip())) and \
-           any(re.match(r'^[A-Z]{3,4}\d{1,2}[A-Z]{3,5}\d{4}$', p.strip()) for p in parts[1:4]): # Check lot_id in columns 2-4
+           any(re.match(LOT_ID_FILTER, p.strip()) for p in parts[1:4]): # Check lot_id in columns 2-4
             data_lines.append(line)
         
-    # Convert to pandas DataFrame
-    data_io = io.StringIO("\n".join(data_lines))
-    
-    # Read with multiple tabs as separator, no header as we'll set names manually
-    df = pd.read_csv(data_io, sep=r'\t+', header=None, names=final_pandas_column_names, engine='python', keep_default_na=False)
+    rows = None
+    if engine in ('auto', 'python'):
+        rows = read_rows_python(data_lines, final_pandas_column_names)
+        if rows is None and engine == 'python':
+            raise ValueError("A data row has more fields than the table has columns; use the pandas engine.")
+    if rows is None:
+        rows = read_rows_pandas(data_lines, final_pandas_column_names)
 
     # Final data transformation into JSON objects
     final_json_lots = []
 
-    for index, row in df.iterrows():
+    for row in rows:
         lot_id_val = clean_value(row.get('lot_id'))
         
         # Only process rows that look like proper lot entries (have a valid lot_id)
-        if lot_id_val and re.match(r'^[A-Z]{3,4}\d{1,2}[A-Z]{3,5}\d{4}$', str(lot_id_val).strip()):
+        if lot_id_val and re.match(LOT_ID_FILTER, str(lot_id_val).strip()):
             
             lot_obj = {
                 "lot_type": clean_value(row.get('lot_type')),
                 "lot_id": lot_id_val,
+                "lot_key": lot_key_to_dict(parse_lot_id(str(lot_id_val))),
                 "contract": {
                     "winner": clean_value(row.get('contract_переможець')),
                     "publication_date": clean_value(row.get('contract_дата_опублікування_договору_в_електронній_системі'))
@@ -261,6 +327,27 @@ def process_table_data(table_text):
         "lots": final_json_lots
     }
 
+def check_engine_parity(table_text):
+    """
+    Parses the table with both engines and returns True if they produce the
+    same JSON; prints the first differing lot otherwise.
+    """
+    python_output = process_table_data(table_text, engine='python')
+    pandas_output = process_table_data(table_text, engine='pandas')
+    if python_output == pandas_output:
+        return True
+
+    for python_lot, pandas_lot in zip(python_output['lots'], pandas_output['lots']):
+        if python_lot != pandas_lot:
+            print(f"Engines differ on lot {python_lot.get('lot_id')}:", file=sys.stderr)
+            print(f"  python: {json.dumps(python_lot, ensure_ascii=False)}", file=sys.stderr)
+            print(f"  pandas: {json.dumps(pandas_lot, ensure_ascii=False)}", file=sys.stderr)
+            break
+    else:
+        print(f"Engines differ: {len(python_output['lots'])} lots (python) vs "
+              f"{len(pandas_output['lots'])} lots (pandas)", file=sys.stderr)
+    return False
+
 # Your provided data for "Дніпровсько-Бузька гирлова система"
 dnieper_bug_data = """
 Дніпровсько-Бузька гирлова система																																																										
@@ -381,21 +468,32 @@ MACRO	1	DBL1MACRO2024					5,48	287,018	3,783	1,371	11,733	1,754	1,425	0,548	7,56
 	1	DBL5MACRO2024	ФОП ТАРАН ІВАН ВОЛОДИМИРОВИЧ	20.03.2024	21.10.2024	DBL5MACRO2024-2	5,48	286,968	3,788	1,356	11,728	1,764	1,420	0,548	7,556	1,904	0,120	0,548	0,012	0,012	0,120	1,480	1,256	0,048	0,012	0,016	0,060	69,300	152,476	3,020	23,132	4,092	1,092	0,108	9	6	1	1	1	46	20	40	55	0	10	0	0	3	0	0	1	0	10	20	0		8	ЯМК 0295
 """
 
-# Читаємо дані з файлу (якщо ви вже зберегли їх у input_table.txt)
-# Якщо ви запускаєте скрипт як є, він обробить вбудовані дані `dnieper_bug_data`
-try:
-    # Закоментуйте наступні 4 рядки, якщо ви використовуєте вбудовані дані `dnieper_bug_data`
-    # з мого прикладу, а не окремий файл input_table.txt
-    # with open('input_table.txt', 'r', encoding='utf-8') as f:
-    #     raw_table_data = f.read()
-    raw_table_data = dnieper_bug_data # Використовуємо вбудовані дані для тестування
-
-except FileNotFoundError:
-    print("Помилка: Файл 'input_table.txt' не знайдено. Переконайтеся, що він у тій самій папці, що й скрипт.")
-    exit()
-except Exception as e:
-    print(f"Помилка при читанні файлу: {e}")
-    exit()
-
-json_output = process_table_data(raw_table_data)
-print(json.dumps(json_output, indent=2, ensure_ascii=False))
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a fishery lots table to JSON.")
+    parser.add_argument('input', nargs='?', help="table text file; defaults to the embedded `dnieper_bug_data`")
+    parser.add_argument('--engine', choices=['auto', 'python', 'pandas'], default='auto')
+    parser.add_argument('--check-parity', action='store_true', help="verify both engines produce identical output")
+    args = parser.parse_args()
+
+    # Якщо файл не вказано, скрипт обробить вбудовані дані `dnieper_bug_data`
+    if args.input:
+        try:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                raw_table_data = f.read()
+        except FileNotFoundError:
+            print(f"Помилка: Файл '{args.input}' не знайдено.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Помилка при читанні файлу: {e}")
+            sys.exit(1)
+    else:
+        raw_table_data = dnieper_bug_data # Використовуємо вбудовані дані для тестування
+
+    if args.check_parity:
+        if not check_engine_parity(raw_table_data):
+            sys.exit(1)
+        print("Both engines produce identical output.")
+        sys.exit(0)
+
+    json_output = process_table_data(raw_table_data, engine=args.engine)
+    print(json.dumps(json_output, indent=2, ensure_ascii=False))
@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import argparse
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# All stage scripts use paths relative to this directory.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(BASE_DIR, '.pipeline_state.json')
+
+# A pipeline stage: the script to run, the stages it must run after, the
+# glob patterns of the files it reads and writes, and optional arguments for
+# the script. Inputs include the local modules the script imports. A stage
+# is skipped when its script and the contents of its inputs are unchanged
+# since its last successful run and all of its outputs exist.
+Stage = namedtuple('Stage', ['name', 'script', 'deps', 'inputs', 'outputs', 'args'], defaults=[()])
+
+STAGES = [
+    Stage('tsv_to_json', 'process_tsv_to_json.py', [],
+          ['data/*.tsv', 'lot_ids.py'],
+          ['public/json/Інформація про користувачів*.json']),
+    Stage('aggregate', 'aggregate_fishery_data.py', ['tsv_to_json'],
+          ['public/json/*.json', 'lot_ids.py'],
+          ['public/json/aggregated_fishery_data.json', 'public/json/lot_index.json']),
+    Stage('fishery_deltas', 'diff_fishery_data.py', ['aggregate'],
+          ['public/json/*.json'],
+          ['public/json/deltas/*/manifest.json']),
+    Stage('total_vessels', 'calculate_total_vessels.py', ['aggregate'],
+          ['public/json/aggregated_fishery_data.json'],
+          []),
+    Stage('vessels_by_winner', 'extract_vessels_by_winner.py', ['aggregate'],
+          ['public/json/aggregated_fishery_data.json'],
+          ['vessels_by_winner.txt']),
+    Stage('unique_locations', 'list_unique_locations.py', ['aggregate'],
+          ['public/json/aggregated_fishery_data.json'],
+          []),
+    Stage('fish_ports', 'normalize_fish_ports.py', [],
+          ['src/data/fish-ports-data.json', 'src/data/fish_ports.json', 'src/data/updated-fish-ports.json'],
+          ['src/data/fish_ports_normalized.json']),
+    Stage('water_body_index', 'build_water_body_index.py', [],
+          ['src/data/vodni_obiekty_1748944527.json'],
+          ['public/json/water_bodies/index.json', 'public/json/water_bodies/chunks/*.json']),
+    # Merges sealed intake log segments; a no-op until submissions arrive.
+    Stage('intake_compaction', 'submission_intake.py', [],
+          ['data/submissions/segment-*'],
+          [], ('compact',)),
+]
+
+
+def expand(patterns):
+    """Expands glob patterns relative to BASE_DIR into a sorted list of paths."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(BASE_DIR, pattern)))
+    return sorted(paths)
+
+
+def input_fingerprint(stage):
+    """
+    Hashes the paths and contents of a stage's script and inputs, so editing
+    the code reruns the stage as well as changing its data. Files the stage
+    writes itself are excluded so a stage reading its own output directory
+    is not considered stale after every run.
+    """
+    outputs = set(expand(stage.outputs))
+    digest = hashlib.sha1()
+    for path in expand([stage.script]) + expand(stage.inputs):
+        if path in outputs:
+            continue
+        digest.update(os.path.relpath(path, BASE_DIR).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha1(f.read()).digest())
+    return digest.hexdigest()
+
+
+def outputs_exist(stage):
+    """Checks that every output pattern of a stage matches at least one file."""
+    return all(expand([pattern]) for pattern in stage.outputs)
+
+
+def validate_stages(stages):
+    """
+    Checks that stage names are unique and dependencies exist, and returns
+    the stages in topological order. Raises ValueError on a cycle.
+    """
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        by_name[stage.name] = stage
+
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    ordered = []
+    visiting = set()
+    visited = set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle involving stage '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.remove(name)
+        visited.add(name)
+        ordered.append(by_name[name])
+
+    for stage in stages:
+        visit(stage.name)
+    return ordered
+
+
+def run_stage(stage, previous_fingerprint, force):
+    """
+    Runs a stage's script in a subprocess unless it is up to date.
+    Returns (status, fingerprint, elapsed seconds, captured output).
+    """
+    started = time.perf_counter()
+    fingerprint = input_fingerprint(stage)
+
+    if not force and fingerprint == previous_fingerprint and outputs_exist(stage):
+        return 'skipped', fingerprint, time.perf_counter() - started, ''
+
+    result = subprocess.run(
+        [sys.executable, stage.script, *stage.args],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+    )
+    output = result.stdout + result.stderr
+    status = 'done' if result.returncode == 0 else 'failed'
+
+    # Re-hash after the run: upstream stages never run concurrently with
+    # their dependents, so only the stage's own writes can have changed it.
+    if status == 'done':
+        fingerprint = input_fingerprint(stage)
+    return status, fingerprint, time.perf_counter() - started, output
+
+
+def load_state():
+    """Loads the input fingerprints recorded by previous runs."""
+    if not os.path.exists(STATE_FILE):
+        return {}
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"Ignoring unreadable pipeline state in {STATE_FILE}")
+        return {}
+
+
+def save_state(state):
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def run_pipeline(stages, jobs=None, force=False):
+    """
+    Runs the stages as a DAG on a worker pool: every stage starts as soon as
+    all of its dependencies have finished, so independent stages run
+    concurrently. Dependents of a failed stage are not run.
+    Returns True if no stage failed.
+    """
+    ordered = validate_stages(stages)
+    state = load_state()
+
+    remaining_deps = {stage.name: set(stage.deps) for stage in ordered}
+    dependents = {stage.name: [] for stage in ordered}
+    for stage in ordered:
+        for dep in stage.deps:
+            dependents[dep].append(stage.name)
+
+    results = {}
+    pipeline_started = time.perf_counter()
+
+    def block(name, reason):
+        # Marks a stage and everything downstream of it as not run.
+        if name in results:
+            return
+        results[name] = ('blocked', 0.0)
+        print(f"[blocked] {name} ({reason})")
+        for child in dependents[name]:
+            block(child, f"depends on {name}")
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        running = {}
+
+        def submit_ready():
+            for stage in ordered:
+                name = stage.name
+                if name in results or name in running.values() or remaining_deps[name]:
+                    continue
+                print(f"[start] {name}")
+                future = executor.submit(run_stage, stage, state.get(name), force)
+                running[future] = name
+
+        submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, fingerprint, elapsed, output = future.result()
+                except Exception as e:
+                    status, fingerprint, elapsed, output = 'failed', None, 0.0, str(e)
+
+                results[name] = (status, elapsed)
+                if output.strip():
+                    for line in output.rstrip().splitlines():
+                        print(f"  {name} | {line}")
+
+                if status == 'failed':
+                    print(f"[failed] {name} after {elapsed:.2f}s")
+                    # A failed run may leave partial outputs behind, so the
+                    # stage must rerun next time whatever its inputs are.
+                    state.pop(name, None)
+                    for child in dependents[name]:
+                        block(child, f"depends on {name}")
+                    continue
+
+                if status == 'skipped':
+                    print(f"[skip] {name} (inputs unchanged)")
+                else:
+                    print(f"[done] {name} in {elapsed:.2f}s")
+                state[name] = fingerprint
+                for child in dependents[name]:
+                    remaining_deps[child].discard(name)
+            submit_ready()
+
+    save_state(state)
+
+    total = time.perf_counter() - pipeline_started
+    print(f"\nPipeline finished in {total:.2f}s")
+    for stage in ordered:
+        status, elapsed = results.get(stage.name, ('blocked', 0.0))
+        print(f"  {stage.name:<20} {status:<8} {elapsed:6.2f}s")
+
+    return all(status != 'failed' for status, _ in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fishery data pipeline.")
+    parser.add_argument('--jobs', type=int, default=None, help="number of stages to run concurrently")
+    parser.add_argument('--force', action='store_true', help="run every stage even if its inputs are unchanged")
+    args = parser.parse_args()
+
+    success = run_pipeline(STAGES, jobs=args.jobs, force=args.force)
+    sys.exit(0 if success else 1)
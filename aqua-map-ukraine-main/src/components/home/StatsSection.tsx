@@ -4,7 +4,7 @@ import React, { useEffect, useState } from 'react';
 import { Building2, Users, Ship } from 'lucide-react';
 import CustomCard from '@/components/ui/CustomCard';
 import waterData from '@/data/vodni_obiekty_1748944527.json';
-import fishPortsData from '@/data/fish_ports.json';
+import fishPortsData from '@/data/fish_ports_normalized.json';
 import { WaterBasin } from '@/types/waterBasin';
 
 const StatsSection = () => {
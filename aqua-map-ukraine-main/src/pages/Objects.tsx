@@ -9,7 +9,7 @@ import CustomCard from '@/components/ui/CustomCard';
 import GoogleMap from '@/components/map/GoogleMap';
 import { Button } from '@/components/ui/button';
 import waterData from '@/data/vodni_obiekty_1748944527.json';
-import processedFishPortsData from '@/data/fish-ports-data.json';
+import normalizedFishPortsData from '@/data/fish_ports_normalized.json';
 import { WaterBasin } from '@/types/waterBasin';
 import FisheryPanel, { LocationCoordinate } from '@/components/fishery/FisheryPanel';
 
@@ -17,7 +17,6 @@ interface FishPort {
   '№': number;
   'Номер місця базування': string;
   'Адреса місця базування': string;
-  'Google Maps Coordinates': string;
   'Власник місця базування': string;
   latitude: number;
   longitude: number;
@@ -74,25 +73,13 @@ const Objects = () => {
         setWaterBasins(data);
         setFilteredBasins(data); // Initialize filtered data
 
+        // Coordinates are pre-parsed and IDs assigned by normalize_fish_ports.py
         const allPorts: FishPort[] = [];
-        let portIndex = 0;
-        for (const region in processedFishPortsData) {
-            if (Object.prototype.hasOwnProperty.call(processedFishPortsData, region)) {
-                const portsInRegion = processedFishPortsData[region as keyof typeof processedFishPortsData];
+        for (const region in normalizedFishPortsData) {
+            if (Object.prototype.hasOwnProperty.call(normalizedFishPortsData, region)) {
+                const portsInRegion = normalizedFishPortsData[region as keyof typeof normalizedFishPortsData];
                 portsInRegion.forEach(port => {
-                    if (port['Google Maps Coordinates']) {
-                        const coords = port['Google Maps Coordinates'].split(',').map(s => parseFloat(s.trim()));
-                        if (coords.length === 2 && !isNaN(coords[0]) && !isNaN(coords[1])) {
-                            const [lat, lon] = coords;
-                            allPorts.push({
-                                ...(port as any),
-                                id: `fish-port-${port['№']}-${portIndex++}`,
-                                region: region,
-                                latitude: lat,
-                                longitude: lon,
-                            });
-                        }
-                    }
+                    allPorts.push({ ...(port as any), region: region });
                 });
             }
         }
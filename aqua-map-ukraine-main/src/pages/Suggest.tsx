@@ -52,8 +52,6 @@ const Suggest = () => {
       leaseExpiry: null // Omitted from form, setting to null
     };
 
-    const fileName = `public/json/submission_${Date.now()}.json`;
-
     // In a real React app, you cannot directly write to the file system from the browser.
     // This would require a backend endpoint to handle the file saving.
     // Since this is a simulated environment, I will use write_to_file tool.
@@ -91,7 +89,9 @@ const Suggest = () => {
     // This will be handled by the environment, not directly by the React component
     // The actual saving will happen after this function returns and the tool is executed.
     // The tool will receive the submissionData as a parameter.
-    // The file name will be unique due to the timestamp.
+    // Not wired up yet: server.ts has no /api/submit-suggestion route. Submissions
+    // are meant to go into the intake log via `submission_intake.py append`, which
+    // assumes a single writer, so the route must serialize appends.
     await fetch('/api/submit-suggestion', { // This would be your actual API endpoint
       method: 'POST',
       headers: {
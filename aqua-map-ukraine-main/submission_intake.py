@@ -0,0 +1,288 @@
+import os
+import sys
+import json
+import bisect
+import argparse
+from datetime import datetime, timezone
+
+# Submissions are kept outside public/json so they are neither served
+# statically nor picked up by aggregate_fishery_data.
+LOG_DIR = 'data/submissions'
+
+SEGMENT_MAX_BYTES = 1024 * 1024
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.ndjson'
+INDEX_SUFFIX = '.idx'
+CURSORS_DIR = 'cursors'
+
+# Index entries are fixed width ("<seq> <offset>\n") so the n-th entry can be
+# read with a single seek and looked up by binary search.
+SEQ_WIDTH = 10
+OFFSET_WIDTH = 12
+INDEX_ENTRY_SIZE = SEQ_WIDTH + 1 + OFFSET_WIDTH + 1
+
+
+def segment_path(log_dir, first_seq):
+    return os.path.join(log_dir, f"{SEGMENT_PREFIX}{first_seq:0{SEQ_WIDTH}d}{SEGMENT_SUFFIX}")
+
+
+def index_path(segment_file):
+    return segment_file[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+
+def list_segments(log_dir):
+    """Returns the first sequence numbers of all segments in ascending order."""
+    if not os.path.isdir(log_dir):
+        return []
+    first_seqs = []
+    for name in os.listdir(log_dir):
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+            first_seqs.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+    return sorted(first_seqs)
+
+
+def index_entry_count(segment_file):
+    idx_file = index_path(segment_file)
+    if not os.path.exists(idx_file):
+        return 0
+    return os.path.getsize(idx_file) // INDEX_ENTRY_SIZE
+
+
+def read_index_entry(idx, position):
+    """Reads the (seq, offset) pair at `position` of an open index file."""
+    idx.seek(position * INDEX_ENTRY_SIZE)
+    seq, offset = idx.read(INDEX_ENTRY_SIZE).split()
+    return int(seq), int(offset)
+
+
+def last_seq(log_dir, first_seqs):
+    """Returns the sequence number of the newest record, or 0 for an empty log."""
+    for first_seq in reversed(first_seqs):
+        segment_file = segment_path(log_dir, first_seq)
+        count = index_entry_count(segment_file)
+        if count:
+            with open(index_path(segment_file), 'rb') as idx:
+                return read_index_entry(idx, count - 1)[0]
+    return 0
+
+
+def write_record(segment, idx, seq, record):
+    """Appends one record to an open segment and its index entry after it."""
+    offset = segment.seek(0, os.SEEK_END)
+    segment.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+    segment.flush()
+    # The index entry is written last: a record without one is never read.
+    # A crash can still leave a partial entry; append_submission() cuts it
+    # off before the next write.
+    idx.write(f"{seq:0{SEQ_WIDTH}d} {offset:0{OFFSET_WIDTH}d}\n".encode('ascii'))
+
+
+def finish_compaction(log_dir):
+    """
+    Completes or discards a compaction interrupted by a crash. compact()
+    swaps in the segment before its index, so a leftover index .tmp without
+    a segment .tmp means the new segment is already in place and only the
+    index switch is missing. If both .tmp files are left over, nothing was
+    swapped and they are removed.
+    """
+    if not os.path.isdir(log_dir):
+        return
+    for name in os.listdir(log_dir):
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(INDEX_SUFFIX + '.tmp')):
+            continue
+        tmp_index = os.path.join(log_dir, name)
+        tmp_segment = tmp_index[:-len(INDEX_SUFFIX + '.tmp')] + SEGMENT_SUFFIX + '.tmp'
+        if os.path.exists(tmp_segment):
+            os.remove(tmp_segment)
+            os.remove(tmp_index)
+        else:
+            os.replace(tmp_index, tmp_index[:-len('.tmp')])
+
+
+def append_submission(log_dir, submission):
+    """
+    Appends a submission to the active segment, starting a new segment once
+    the active one reaches SEGMENT_MAX_BYTES. The log assumes a single writer.
+    Returns the sequence number assigned to the submission.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    finish_compaction(log_dir)
+    first_seqs = list_segments(log_dir)
+    seq = last_seq(log_dir, first_seqs) + 1
+
+    if first_seqs and os.path.getsize(segment_path(log_dir, first_seqs[-1])) < SEGMENT_MAX_BYTES:
+        segment_file = segment_path(log_dir, first_seqs[-1])
+    else:
+        segment_file = segment_path(log_dir, seq)
+
+    # Readers round a partial trailing index entry down, but appending after
+    # its bytes would shift every later entry, so drop it first.
+    idx_file = index_path(segment_file)
+    complete_size = index_entry_count(segment_file) * INDEX_ENTRY_SIZE
+    if os.path.exists(idx_file) and os.path.getsize(idx_file) != complete_size:
+        os.truncate(idx_file, complete_size)
+
+    record = {
+        "seq": seq,
+        "received_at": datetime.now(timezone.utc).isoformat(),
+        "submission": submission,
+    }
+    with open(segment_file, 'ab') as segment, open(index_path(segment_file), 'ab') as idx:
+        write_record(segment, idx, seq, record)
+    return seq
+
+
+def read_segment(segment_file, after_seq=0):
+    """Yields the records of one segment with seq > after_seq, in order."""
+    count = index_entry_count(segment_file)
+    if not count:
+        return
+
+    with open(index_path(segment_file), 'rb') as idx, open(segment_file, 'rb') as segment:
+        # Binary search for the first indexed record past the cursor.
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if read_index_entry(idx, middle)[0] <= after_seq:
+                low = middle + 1
+            else:
+                high = middle
+
+        for position in range(low, count):
+            _, offset = read_index_entry(idx, position)
+            segment.seek(offset)
+            yield json.loads(segment.readline().decode('utf-8'))
+
+
+def read_submissions(log_dir, after_seq=0):
+    """Yields all records with seq > after_seq, skipping segments before it."""
+    finish_compaction(log_dir)
+    first_seqs = list_segments(log_dir)
+    start = max(bisect.bisect_right(first_seqs, after_seq) - 1, 0)
+    for first_seq in first_seqs[start:]:
+        for record in read_segment(segment_path(log_dir, first_seq), after_seq):
+            yield record
+            after_seq = record["seq"]
+
+
+def cursor_path(log_dir, consumer):
+    return os.path.join(log_dir, CURSORS_DIR, f"{consumer}.json")
+
+
+def load_cursor(log_dir, consumer):
+    """Returns the last sequence number processed by a consumer."""
+    path = cursor_path(log_dir, consumer)
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["seq"]
+
+
+def save_cursor(log_dir, consumer, seq):
+    path = cursor_path(log_dir, consumer)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"seq": seq}, f)
+    os.replace(tmp_path, path)
+
+
+def process_new_submissions(log_dir, consumer, handler):
+    """
+    Passes every record the consumer has not seen yet to `handler` and
+    advances its cursor after each one, so work is O(new records).
+    Returns the number of records processed.
+    """
+    cursor = load_cursor(log_dir, consumer)
+    processed = 0
+    for record in read_submissions(log_dir, cursor):
+        handler(record)
+        save_cursor(log_dir, consumer, record["seq"])
+        processed += 1
+    return processed
+
+
+def compact(log_dir):
+    """
+    Rewrites all sealed segments (every segment but the active one) into a
+    single segment, keeping only the newest record per submission id.
+    Sequence numbers are preserved, so consumer cursors stay valid.
+    Run it while no other process is reading or appending to the log;
+    the pipeline runs it as the intake_compaction stage.
+    """
+    finish_compaction(log_dir)
+    first_seqs = list_segments(log_dir)
+    sealed = first_seqs[:-1]
+    if not sealed:
+        print("Nothing to compact")
+        return
+
+    # Segments left behind by an interrupted compaction repeat records of
+    # the compacted one; reading by seq skips them like read_submissions.
+    records = []
+    after_seq = 0
+    for first_seq in sealed:
+        for record in read_segment(segment_path(log_dir, first_seq), after_seq):
+            records.append(record)
+            after_seq = record["seq"]
+
+    newest = {}
+    for record in records:
+        submission_id = (record.get("submission") or {}).get("id")
+        if submission_id is not None:
+            newest[submission_id] = record["seq"]
+    kept = [r for r in records
+            if newest.get((r.get("submission") or {}).get("id"), r["seq"]) == r["seq"]]
+    if len(sealed) == 1 and len(kept) == len(records):
+        print("Nothing to compact")
+        return
+
+    compacted_file = segment_path(log_dir, sealed[0])
+    tmp_segment, tmp_index = compacted_file + '.tmp', index_path(compacted_file) + '.tmp'
+    with open(tmp_segment, 'wb') as segment, open(tmp_index, 'wb') as idx:
+        for record in kept:
+            write_record(segment, idx, record["seq"], record)
+
+    # The segment is swapped in before its index; finish_compaction() completes
+    # the index switch if a crash falls between the two. Old segments are
+    # deleted last: until then their records are also in the compacted one,
+    # which readers skip by seq.
+    os.replace(tmp_segment, compacted_file)
+    os.replace(tmp_index, index_path(compacted_file))
+    for first_seq in sealed[1:]:
+        old_segment = segment_path(log_dir, first_seq)
+        os.remove(index_path(old_segment))
+        os.remove(old_segment)
+
+    print(f"Compacted {len(sealed)} segments: {len(records)} records -> {len(kept)}")
+
+
+def print_submission(record):
+    submission = record.get("submission") or {}
+    print(f"#{record['seq']} {submission.get('id')} {submission.get('waterBodyName')} "
+          f"({(submission.get('location') or {}).get('region')})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append-only intake log for user submissions.")
+    parser.add_argument('--log-dir', default=LOG_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    append_parser = subparsers.add_parser('append', help="append a submission JSON read from a file or stdin")
+    append_parser.add_argument('file', nargs='?')
+    process_parser = subparsers.add_parser('process', help="list submissions not yet seen by a consumer")
+    process_parser.add_argument('--consumer', default='review')
+    subparsers.add_parser('compact', help="merge sealed segments and drop superseded submissions")
+    args = parser.parse_args()
+
+    if args.command == 'append':
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                submission = json.load(f)
+        else:
+            submission = json.load(sys.stdin)
+        print(f"Appended submission #{append_submission(args.log_dir, submission)}")
+    elif args.command == 'process':
+        count = process_new_submissions(args.log_dir, args.consumer, print_submission)
+        print(f"Processed {count} new submissions for '{args.consumer}'")
+    elif args.command == 'compact':
+        compact(args.log_dir)
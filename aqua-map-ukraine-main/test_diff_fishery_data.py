@@ -0,0 +1,112 @@
+import os
+import copy
+import json
+import glob
+import tempfile
+import unittest
+
+from diff_fishery_data import load_lot_map, lot_hash, dataset_version, compute_delta, apply_delta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JSON_DIR = os.path.join(BASE_DIR, 'public', 'json')
+DELTAS_DIR = os.path.join(JSON_DIR, 'deltas')
+# A reservoir table with repeated lot IDs (DUN1MIN2024 and others).
+DUPLICATED_DATASET = os.path.join(
+    JSON_DIR, 'Інформація про користувачів, які здійснюють спеціальне використання водних біоресурсів у 2024 році - Дунай.json')
+
+
+def dataset_files():
+    """Returns the committed dataset files that have delta artifacts."""
+    files = []
+    for manifest_file in sorted(glob.glob(os.path.join(DELTAS_DIR, '*', 'manifest.json'))):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            name = json.load(f)["dataset"]
+        files.append(os.path.join(JSON_DIR, f"{name}.json"))
+    return files
+
+
+def all_lots(data):
+    if isinstance(data, dict) and 'lots' in data:
+        return data['lots']
+    return [lot for lots in data.values() for lot in lots]
+
+
+def older_version(data):
+    """
+    Derives a plausible previous version of a dataset: lot_key not yet
+    stored, the first lot missing and the last lot's winner different.
+    """
+    old = copy.deepcopy(data)
+    groups = [old['lots']] if isinstance(old, dict) and 'lots' in old else list(old.values())
+
+    for lots in groups:
+        for lot in lots:
+            lot.pop('lot_key', None)
+    non_empty = [lots for lots in groups if lots]
+    non_empty[0].pop(0)
+    if non_empty[-1]:
+        non_empty[-1][-1].setdefault('contract', {})['winner'] = 'Попередній користувач'
+    return old
+
+
+class DiffFisheryDataTest(unittest.TestCase):
+
+    def load_from(self, data):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(data, f, ensure_ascii=False)
+        try:
+            return load_lot_map(f.name)
+        finally:
+            os.remove(f.name)
+
+    def test_lot_map_keeps_every_lot(self):
+        for file_path in dataset_files():
+            with self.subTest(dataset=os.path.basename(file_path)):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                with_id = [lot for lot in all_lots(data) if lot.get('lot_id')]
+                self.assertEqual(len(load_lot_map(file_path)), len(with_id))
+
+    def test_removing_a_repeat_only_touches_its_lot_id(self):
+        with open(DUPLICATED_DATASET, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        lot_ids = [lot.get('lot_id') for lot in data['lots']]
+        position = next(i for i, lot_id in enumerate(lot_ids) if lot_id and lot_ids.count(lot_id) > 1)
+
+        old_lots = load_lot_map(DUPLICATED_DATASET)
+        new_lots = self.load_from(dict(data, lots=data['lots'][:position] + data['lots'][position + 1:]))
+        old_hashes = {key: lot_hash(lot) for key, lot in old_lots.items()}
+        delta, _ = compute_delta(old_hashes, new_lots)
+        # Keys of later repeats must not shift; only the removed lot's own
+        # lot_id group may be re-keyed.
+        touched = list(delta["added"]) + delta["removed"] + list(delta["changed"])
+        self.assertTrue(delta["removed"])
+        self.assertTrue(all(key.split('|', 1)[1].split('#')[0] == lot_ids[position] for key in touched), touched)
+
+    def test_manifest_latest_matches_dataset(self):
+        for file_path in dataset_files():
+            with self.subTest(dataset=os.path.basename(file_path)):
+                name = os.path.splitext(os.path.basename(file_path))[0]
+                with open(os.path.join(DELTAS_DIR, name, 'manifest.json'), 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                hashes = {key: lot_hash(lot) for key, lot in load_lot_map(file_path).items()}
+                self.assertEqual(manifest["latest"], dataset_version(hashes))
+
+    def test_apply_delta_round_trip(self):
+        for file_path in dataset_files():
+            with self.subTest(dataset=os.path.basename(file_path)):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                old_lots = self.load_from(older_version(data))
+                new_lots = load_lot_map(file_path)
+
+                old_hashes = {key: lot_hash(lot) for key, lot in old_lots.items()}
+                delta, _ = compute_delta(old_hashes, new_lots)
+                self.assertEqual(apply_delta(old_lots, delta), new_lots)
+
+                base, _ = compute_delta({}, new_lots)
+                self.assertEqual(apply_delta({}, base), new_lots)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from lot_ids import LotKey, parse_lot_id, natural_sort_key, build_range_index, query_range
+
+
+def make_lots(basin, lot_type, year, sequences):
+    return [{"lot_id": f"{basin}{sequence}{lot_type}{year}"} for sequence in sequences]
+
+
+def lot_ids(lots):
+    return [lot["lot_id"] for lot in lots]
+
+
+class ParseLotIdTest(unittest.TestCase):
+
+    def test_basin_code_lengths(self):
+        self.assertEqual(parse_lot_id('TL1MAX2024'), LotKey('TL', 1, 'MAX', 2024))
+        self.assertEqual(parse_lot_id('CHDES3MIN2024'), LotKey('CHDES', 3, 'MIN', 2024))
+        self.assertEqual(parse_lot_id('DBL2MACRO2024'), LotKey('DBL', 2, 'MACRO', 2024))
+
+    def test_invalid_ids(self):
+        for lot_id in (None, '', 'Разом', 'DBL2024', 12):
+            self.assertIsNone(parse_lot_id(lot_id))
+
+    def test_natural_sort_key(self):
+        lots = [{"lot_id": "DBL10MIN2024"}, {"lot_id": None}, {"lot_id": "DBL2MIN2024"},
+                {"lot_id": "DBL1MAX2024"}]
+        self.assertEqual(lot_ids(sorted(lots, key=natural_sort_key)),
+                         ["DBL2MIN2024", "DBL10MIN2024", "DBL1MAX2024", None])
+
+
+class QueryRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        lots = (make_lots('DBL', 'MIN', 2024, range(1, 13))
+                + make_lots('DBL', 'MAX', 2023, range(1, 4))
+                + make_lots('DBL', 'MAX', 2024, range(1, 13))
+                + make_lots('KAM', 'MAX', 2024, range(1, 3))
+                + make_lots('KRE', 'MID', 2023, range(1, 16))
+                + make_lots('KRE', 'MID', 2024, range(1, 16))
+                + make_lots('KRE', 'MAX', 2024, range(5, 9)))
+        self.index = build_range_index(lots)
+
+    def test_type_and_year(self):
+        # All MAX lots of DBL in 2024.
+        self.assertEqual(lot_ids(query_range(self.index, 'DBL', 'MAX', 2024)),
+                         [f"DBL{n}MAX2024" for n in range(1, 13)])
+
+    def test_type_year_and_sequence_range(self):
+        # Lots 5-12 of KRE MID in 2024.
+        self.assertEqual(lot_ids(query_range(self.index, 'KRE', 'MID', 2024, 5, 12)),
+                         [f"KRE{n}MID2024" for n in range(5, 13)])
+
+    def test_type_and_sequence_range_without_year(self):
+        # Lots 5-12 of KRE MID across years: two runs, one per year, and no
+        # KRE MAX lots although their sequences fall in the range.
+        self.assertEqual(lot_ids(query_range(self.index, 'KRE', 'MID', first=5, last=12)),
+                         [f"KRE{n}MID2023" for n in range(5, 13)]
+                         + [f"KRE{n}MID2024" for n in range(5, 13)])
+
+    def test_basin_only(self):
+        self.assertEqual(len(query_range(self.index, 'DBL')), 12 + 3 + 12)
+        self.assertEqual(query_range(self.index, 'XYZ'), [])
+
+    def test_open_ended_sequence_range(self):
+        self.assertEqual(lot_ids(query_range(self.index, 'DBL', 'MAX', 2024, first=11)),
+                         ["DBL11MAX2024", "DBL12MAX2024"])
+        self.assertEqual(lot_ids(query_range(self.index, 'DBL', 'MAX', 2023, last=2)),
+                         ["DBL1MAX2023", "DBL2MAX2023"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import re
+import sys
+import glob
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'public', 'json'))
+
+from process_table import LOT_ID_FILTER, process_table_data, dnieper_bug_data
+
+TSV_FILES = sorted(glob.glob(os.path.join(BASE_DIR, 'data', '*.tsv')))
+
+# A table whose tag column holds only numbers, which pandas would read as
+# a numeric column unless every column is read as text.
+NUMERIC_TAGS_TABLE = "\n".join([
+    "Тестова ділянка",
+    "Вид лоту\tКількість лотів\tНомер лоту\tДОГОВІР\tДозвіл\tІдентифікаційні номера бирок",
+    "\t\t\tпереможець\tномер\t",
+    "\t\t\t\t\t",
+    "MIN\t1\tTST1MIN2024\tФОП Перший\t12\t0123",
+    "MIN\t1\tTST2MIN2024\tФОП Другий\t13\t1.50",
+])
+
+
+def widen_data_row(table_text, extra_fields=100):
+    """Appends extra fields to the first data row so it is wider than the header."""
+    lines = table_text.split('\n')
+    for i, line in enumerate(lines):
+        if any(re.match(LOT_ID_FILTER, part.strip()) for part in line.split('\t')[1:4]):
+            lines[i] = line.rstrip('\n') + '\tx' * extra_fields
+            return '\n'.join(lines)
+    raise AssertionError("no data row found")
+
+
+class EngineParityTest(unittest.TestCase):
+
+    def assert_parity(self, table_text):
+        self.assertEqual(process_table_data(table_text, engine='python'),
+                         process_table_data(table_text, engine='pandas'))
+
+    def test_embedded_sample(self):
+        self.assert_parity(dnieper_bug_data)
+
+    def test_data_tables(self):
+        self.assertTrue(TSV_FILES)
+        for file_path in TSV_FILES:
+            with self.subTest(table=os.path.basename(file_path)):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    self.assert_parity(f.read())
+
+    def test_numeric_tag_column(self):
+        self.assert_parity(NUMERIC_TAGS_TABLE)
+        lots = process_table_data(NUMERIC_TAGS_TABLE, engine='pandas')['lots']
+        self.assertEqual([lot['tag_ids'] for lot in lots], [['0123'], ['1.50']])
+
+    def test_over_wide_row_falls_back_to_pandas(self):
+        # pandas reads the surplus leading fields as an index, shifting every
+        # row; whatever it makes of the table, 'auto' must return the same.
+        with open(TSV_FILES[0], 'r', encoding='utf-8') as f:
+            table_text = widen_data_row(f.read())
+        with self.assertRaises(ValueError):
+            process_table_data(table_text, engine='python')
+        self.assertEqual(process_table_data(table_text, engine='auto'),
+                         process_table_data(table_text, engine='pandas'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import submission_intake
+from submission_intake import (
+    append_submission, read_submissions, process_new_submissions, load_cursor,
+    list_segments, segment_path, index_path, compact,
+)
+
+
+class SubmissionIntakeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self.tmp.name
+        # Small segments so a handful of records spans several of them.
+        self.segment_max = mock.patch.object(submission_intake, 'SEGMENT_MAX_BYTES', 200)
+        self.segment_max.start()
+
+    def tearDown(self):
+        self.segment_max.stop()
+        self.tmp.cleanup()
+
+    def append(self, count, ids=4):
+        """Appends `count` submissions cycling through `ids` submission ids."""
+        return [append_submission(self.log_dir, {"id": f"s{i % ids}", "waterBodyName": f"w{i}"})
+                for i in range(count)]
+
+    def seqs(self, after_seq=0):
+        return [record["seq"] for record in read_submissions(self.log_dir, after_seq)]
+
+    def compact_quietly(self):
+        with redirect_stdout(io.StringIO()):
+            compact(self.log_dir)
+
+    def test_append_rolls_over_segments(self):
+        self.assertEqual(self.append(12), list(range(1, 13)))
+        first_seqs = list_segments(self.log_dir)
+        self.assertGreater(len(first_seqs), 1)
+        self.assertEqual(first_seqs[0], 1)
+        self.assertEqual(self.seqs(), list(range(1, 13)))
+
+    def test_read_from_cursor(self):
+        self.append(12)
+        self.assertEqual(self.seqs(after_seq=7), [8, 9, 10, 11, 12])
+
+        seen = []
+        self.assertEqual(process_new_submissions(self.log_dir, 'review', seen.append), 12)
+        self.assertEqual(load_cursor(self.log_dir, 'review'), 12)
+        self.assertEqual(process_new_submissions(self.log_dir, 'review', seen.append), 0)
+        self.append(1)
+        self.assertEqual(process_new_submissions(self.log_dir, 'review', seen.append), 1)
+        self.assertEqual([record["seq"] for record in seen], list(range(1, 14)))
+
+    def test_compact_drops_superseded_ids(self):
+        self.append(12)
+        before = list(read_submissions(self.log_dir))
+        self.compact_quietly()
+        after = list(read_submissions(self.log_dir))
+
+        # Sealed segments keep only the newest record per id; sequence
+        # numbers are unchanged and the active segment is left alone.
+        sealed_end = list_segments(self.log_dir)[-1]
+        newest = {}
+        for record in before:
+            if record["seq"] < sealed_end:
+                newest[record["submission"]["id"]] = record["seq"]
+        expected = sorted(newest.values()) + [r["seq"] for r in before if r["seq"] >= sealed_end]
+        self.assertEqual([record["seq"] for record in after], expected)
+        self.assertEqual(len(list_segments(self.log_dir)), 2)
+
+        # A cursor taken before compaction still resumes at the right record.
+        self.assertEqual(self.seqs(after_seq=before[-2]["seq"]), [before[-1]["seq"]])
+
+    def crash_on_replace(self, call):
+        """Runs compact() and raises on the `call`-th os.replace, like a crash."""
+        real_replace = os.replace
+        calls = []
+
+        def replace(src, dst):
+            calls.append(src)
+            if len(calls) == call:
+                raise KeyboardInterrupt("crash")
+            real_replace(src, dst)
+
+        with mock.patch.object(submission_intake.os, 'replace', replace):
+            with self.assertRaises(KeyboardInterrupt):
+                self.compact_quietly()
+
+    def leftover_tmp_files(self):
+        return [name for name in os.listdir(self.log_dir) if name.endswith('.tmp')]
+
+    def test_recovery_after_segment_swap(self):
+        self.append(12)
+        expected = self.seqs()
+        self.crash_on_replace(2)
+        self.assertEqual(len(self.leftover_tmp_files()), 1)
+
+        # The new segment is in place; the reader completes the index switch.
+        compacted = self.seqs()
+        self.assertEqual(self.leftover_tmp_files(), [])
+        self.assertEqual(compacted[-1], expected[-1])
+        self.assertLess(len(compacted), len(expected))
+
+        # Compacting again removes the leftover old segments without
+        # duplicating records.
+        self.compact_quietly()
+        self.assertEqual(self.seqs(), compacted)
+        self.assertEqual(len(list_segments(self.log_dir)), 2)
+
+    def test_recovery_before_any_swap(self):
+        self.append(12)
+        expected = self.seqs()
+        self.crash_on_replace(1)
+        self.assertEqual(len(self.leftover_tmp_files()), 2)
+
+        # Nothing was swapped: the leftovers are discarded, the log is as before.
+        self.assertEqual(self.seqs(), expected)
+        self.assertEqual(self.leftover_tmp_files(), [])
+
+    def test_append_after_partial_index_entry(self):
+        self.append(3)
+        segment_file = segment_path(self.log_dir, list_segments(self.log_dir)[-1])
+        with open(index_path(segment_file), 'ab') as idx:
+            idx.write(b'0000000004 00')
+        self.assertEqual(self.seqs(), [1, 2, 3])
+        self.append(1)
+        self.assertEqual(self.seqs(), [1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()